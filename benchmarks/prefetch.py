@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark for ``jsonschema_prefetch_workers``.
+
+It builds a project having many documents referring the same large schemas
+with ``sphinx-build -j``, with and without prefetching.  Without prefetching,
+each forked reader decodes the schemas by itself.
+
+    python benchmarks/prefetch.py [--documents 64] [--schemas 4] [--jobs 4]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def make_schema(size):
+    properties = {}
+    for i in range(size):
+        properties['prop%d' % i] = {
+            'type': 'object',
+            'description': 'property %d' % i,
+            'properties': {
+                'name': {'type': 'string', 'maxLength': 64},
+                'count': {'type': 'integer', 'minimum': 0},
+                'tags': {'type': 'array', 'items': {'type': 'string'}},
+            },
+        }
+    return {'type': 'object', 'properties': properties}
+
+
+def make_project(srcdir, documents, schemas, size):
+    with open(os.path.join(srcdir, 'conf.py'), 'w') as f:
+        f.write("extensions = ['sphinxcontrib.jsonschema']\n")
+
+    for i in range(schemas):
+        with open(os.path.join(srcdir, 'schema%d.json' % i), 'w') as f:
+            json.dump(make_schema(size), f)
+
+    with open(os.path.join(srcdir, 'index.rst'), 'w') as f:
+        f.write('.. toctree::\n   :glob:\n\n   doc*\n')
+
+    for i in range(documents):
+        with open(os.path.join(srcdir, 'doc%d.rst' % i), 'w') as f:
+            f.write('doc%d\n=====\n\n' % i)
+            for j in range(schemas):
+                f.write('.. jsonschema:: schema%d.json\n   :max-rows: 10\n\n' % j)
+
+
+def build(srcdir, jobs, workers):
+    outdir = tempfile.mkdtemp()
+    try:
+        command = [sys.executable, '-m', 'sphinx', '-Q', '-E', '-b', 'dummy', '-j', str(jobs),
+                   '-D', 'jsonschema_prefetch_workers=%d' % workers, srcdir, outdir]
+        started = time.time()
+        subprocess.check_call(command)
+        return time.time() - started
+    finally:
+        shutil.rmtree(outdir)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=64)
+    parser.add_argument('--schemas', type=int, default=4)
+    parser.add_argument('--size', type=int, default=5000, help='number of properties in a schema')
+    parser.add_argument('--jobs', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    options = parser.parse_args()
+
+    srcdir = tempfile.mkdtemp()
+    try:
+        make_project(srcdir, options.documents, options.schemas, options.size)
+        for workers in (0, options.schemas):
+            timings = [build(srcdir, options.jobs, workers) for _ in range(options.repeat)]
+            print('jsonschema_prefetch_workers=%d: %.2f s (best of %d)' % (workers, min(timings), options.repeat))
+    finally:
+        shutil.rmtree(srcdir)
+
+
+if __name__ == '__main__':
+    main()
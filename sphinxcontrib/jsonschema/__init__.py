@@ -0,0 +1,1274 @@
+"""
+    sphinxcontrib.jsonschema
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: Copyright 2014 by Takeshi KOMIYA <i.tkomiya@gmail.com>
+    :license: BSD, see LICENSE for details.
+"""
+import io
+import os
+import hashlib
+import re
+import sys
+from binascii import hexlify
+from multiprocessing.pool import ThreadPool
+from six import string_types, text_type
+from docutils import nodes
+from docutils.statemachine import ViewList
+from docutils.parsers.rst import Directive, directives
+from sphinx.util.osutil import ensuredir, relative_uri
+
+if sys.version_info < (2, 7):
+    import simplejson as json
+    from ordereddict import OrderedDict
+else:
+    import json
+    from collections import OrderedDict
+
+if sys.version_info < (3, 2):
+    from cgi import escape
+else:
+    from html import escape
+
+
+# in-process cache of loaded schemas: {abspath: (mtime, schema)}
+schema_cache = {}
+
+directive_re = re.compile(r'^\s*\.\.\s+jsonschema(?:-diff)?::\s+(\S.*?)\s*$', re.M)
+
+
+def get_int_config(config, name):
+    """Returns an integer config value; the ones given by -D option are strings."""
+    value = getattr(config, name)
+    if value is None or value == '':
+        return None
+    else:
+        return int(value)
+
+
+def get_schema_path(env, docname, filename):
+    dirname = os.path.dirname(env.doc2path(docname, base=None))
+    relpath = os.path.join(dirname, filename)
+    abspath = os.path.join(env.srcdir, relpath)
+    return relpath, abspath
+
+
+def load_schema(abspath):
+    """Load a schema file through the in-process cache."""
+    mtime = os.stat(abspath).st_mtime
+    cached = schema_cache.get(abspath)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    schema = JSONSchema.loadfromfile(abspath)
+    cache_schema(abspath, mtime, schema)
+    return schema
+
+
+def cache_schema(abspath, mtime, schema):
+    schema.digests = {}
+    get_digest(schema.attributes, schema.digests)
+    schema_cache[abspath] = (mtime, schema)
+
+
+def read_schema(abspath):
+    """Read a schema file in a worker thread; returns (abspath, mtime, data)."""
+    try:
+        mtime = os.stat(abspath).st_mtime
+        with io.open(abspath, 'rb') as reader:
+            return abspath, mtime, reader.read()
+    except (IOError, OSError):
+        return None  # reported by the directive itself
+
+
+def pattern_list(argument):
+    if argument is None:
+        raise ValueError('argument required but none supplied')
+    return argument.replace(',', ' ').split()
+
+
+class JSONSchemaDirective(Directive):
+    has_content = True
+    required_arguments = 1
+    option_spec = {
+        'include': pattern_list,
+        'exclude': pattern_list,
+        'max-rows': directives.nonnegative_int,
+        'max-depth': directives.nonnegative_int,
+        'max-nodes': directives.nonnegative_int,
+        'dedupe': directives.flag,
+    }
+
+    def run(self):
+        try:
+            if self.arguments and self.content:
+                raise self.warning('both argument and content. it is invalid')
+            if self.arguments:
+                schema = self.load(self.arguments[0])
+            else:
+                schema = JSONSchema.loadfromfile(''.join(self.content))
+        except ValueError as exc:
+            raise self.error('Failed to parse JSON Schema: %s' % exc)
+
+        limits = self.get_limits()
+        filters = PropertyFilter(self.options.get('include'), self.options.get('exclude'))
+        shared = self.get_shared_definitions()
+        if shared:
+            shared.count(schema, filters)
+
+        table, tbody = self.make_table()
+        result = [table]
+        try:
+            self.build_rows(tbody, schema.with_limits(limits, filters), shared)
+            while shared and shared.pending:
+                node = shared.pending[0]
+                table, tbody = self.make_table()
+                result.append(nodes.target('', '', ids=[node.refid]))
+                result.append(nodes.rubric(text='Definition: %s' % (node.title or node.name)))
+                result.append(table)
+                shared.pending.pop(0)
+
+                # the rows of shared definitions are not filtered (see SharedDefinitions.is_shareable)
+                definition = node.instantiate(None, node.attributes, depth=node.depth)
+                definition.filters = None
+                self.build_rows(tbody, definition, shared)
+        except LimitExceeded as exc:
+            result.append(self.truncate(tbody, exc))
+            if shared:
+                # the definitions of this directive might not be rendered completely
+                refids = shared.discard()
+                result = [node for node in result if not is_target_for(node, refids)]
+                for node in result:
+                    for reference in findall(node, nodes.reference):
+                        if reference.get('refid') in refids:
+                            reference.replace_self(nodes.Text(reference.astext()))
+                    for target in findall(node, nodes.target):
+                        if is_target_for(target, refids):
+                            target.parent.remove(target)
+
+        return result
+
+    def build_rows(self, tbody, schema, shared=None):
+        for prop in schema:
+            schema.limits.count_row()
+            if shared and prop.type == "object":
+                shared.register(prop)
+
+            row = nodes.row()
+            row += self.cell(prop.name)
+            if prop.anchor:
+                row[-1][0].insert(0, nodes.target('', '', ids=[prop.anchor]))
+
+            if prop.required:
+                typename = prop.type + " (required)"
+            else:
+                typename = prop.type
+
+            if prop.refid:
+                reference = nodes.reference('', typename, refid=prop.refid, internal=True)
+                row += nodes.entry('', nodes.paragraph('', '', reference))
+            else:
+                row += self.cell(typename)
+            row += self.cell(prop.description or '')
+            row += self.cell('\n'.join(('* %s' % v for v in prop.validations)))
+            tbody += row
+
+    def truncate(self, tbody, exc):
+        """Appends a truncation row to the table; returns a warning for it."""
+        row = nodes.row()
+        row += self.cell('...')
+        for i in range(tbody.parent['cols'] - 2):
+            row += self.cell('')
+        row += self.cell('Truncated: the schema has %s' % exc)
+        tbody += row
+
+        name = ' '.join(self.arguments) if self.arguments else 'content'
+        message = 'JSON Schema %s is truncated: it has %s' % (name, exc)
+        return self.state.document.reporter.warning(message, line=self.lineno)
+
+    def get_shared_definitions(self):
+        env = self.state.document.settings.env
+        if 'dedupe' in self.options or env.config.jsonschema_dedupe:
+            # shared among the directives in the current document
+            return env.temp_data.setdefault('jsonschema_shared_definitions', SharedDefinitions())
+        else:
+            return None
+
+    def get_limits(self):
+        config = self.state.document.settings.env.config
+        return TraversalLimits(self.options.get('max-rows', get_int_config(config, 'jsonschema_max_rows')),
+                               self.options.get('max-depth', get_int_config(config, 'jsonschema_max_depth')),
+                               self.options.get('max-nodes', get_int_config(config, 'jsonschema_max_nodes')))
+
+    def load(self, filename):
+        env = self.state.document.settings.env
+        relpath, abspath = get_schema_path(env, env.docname, filename)
+        if not os.access(abspath, os.R_OK):
+            raise self.warning('JSON Schema file not readable: %s' % filename)
+        env.note_dependency(relpath)
+
+        return load_schema(abspath)
+
+    def make_table(self, headers=None, widths=None):
+        if headers is None:
+            headers = ['Name', 'Type', 'Description', 'Validations']
+            widths = [1, 1, 1, 2]
+
+        tgroup = nodes.tgroup(cols=len(headers))
+        for width in widths:
+            tgroup += nodes.colspec(colwidth=width)
+
+        table = nodes.table('', tgroup, classes=['jsonschema'])
+        header_row = nodes.row()
+        for header in headers:
+            entry = nodes.entry('', nodes.paragraph(text=header))
+            header_row += entry
+
+        tgroup += nodes.thead('', header_row)
+        tbody = nodes.tbody()
+        tgroup += tbody
+        return table, tbody
+
+    def cell(self, text):
+        env = self.state.document.settings.env
+        if not isinstance(text, string_types):
+            text = str(text)
+
+        # LRU cache of parsed cells in the current document: {text: [node, ...]}
+        cell_cache = env.temp_data.setdefault('jsonschema_cell_cache', OrderedDict())
+        if text in cell_cache:
+            cell_cache[text] = cached = cell_cache.pop(text)  # mark as recently used
+            return nodes.entry('', *[node.deepcopy() for node in cached])
+
+        entry = nodes.entry()
+        viewlist = ViewList(text.split('\n'), source=text)
+        self.state.nested_parse(viewlist, 0, entry)
+
+        size = env.config.jsonschema_cell_cache_size
+        if size and is_cacheable(entry):
+            cell_cache[text] = [node.deepcopy() for node in entry]
+            while len(cell_cache) > size:
+                cell_cache.popitem(last=False)
+
+        return entry
+
+
+def findall(node, condition=None):
+    if hasattr(node, 'findall'):  # docutils 0.18 or above
+        return list(node.findall(condition))
+    else:
+        return node.traverse(condition)
+
+
+def is_target_for(node, refids):
+    return isinstance(node, nodes.target) and any(node_id in refids for node_id in node['ids'])
+
+
+def is_cacheable(node):
+    """Checks the parsed cell has no side effects on the document.
+
+    System messages, targets and references are registered to the document
+    on parsing, so their copies would not be processed correctly.
+    """
+    for subnode in findall(node, nodes.Element):
+        if isinstance(subnode, (nodes.system_message, nodes.pending)):
+            return False
+        elif subnode is not node and (subnode['ids'] or subnode['names']):
+            return False
+        elif 'refname' in subnode:
+            return False
+
+    return True
+
+
+class JSONSchemaDiffDirective(JSONSchemaDirective):
+    has_content = False
+    required_arguments = 2
+    option_spec = {
+        'max-rows': directives.nonnegative_int,
+        'max-depth': directives.nonnegative_int,
+        'max-nodes': directives.nonnegative_int,
+    }
+
+    def run(self):
+        try:
+            old = self.load(self.arguments[0])
+            new = self.load(self.arguments[1])
+        except ValueError as exc:
+            raise self.error('Failed to parse JSON Schema: %s' % exc)
+
+        headers = ['Name', 'Change', 'Type', 'Description', 'Validations']
+        widths = [1, 1, 1, 1, 2]
+        table, tbody = self.make_table(headers, widths)
+        limits = self.get_limits()
+        try:
+            for change in JSONSchema.diff(old.with_limits(limits), new.with_limits(limits)):
+                limits.count_row()
+                row = nodes.row()
+                row += self.cell(change.name)
+                row += self.cell(change.status)
+                row += self.cell(change.type)
+                row += self.cell(change.description or '')
+                row += self.cell('\n'.join(('* %s' % v for v in change.validations)))
+                tbody += row
+        except LimitExceeded as exc:
+            return [table, self.truncate(tbody, exc)]
+
+        return [table]
+
+
+def get_class_for(obj):
+    mapping = {
+        'null': Null,
+        'boolean': Boolean,
+        'integer': Integer,
+        'number': Number,
+        'string': String,
+        'array': Array,
+        'object': Object,
+    }
+    if isinstance(obj, string_types):
+        type = obj
+    else:
+        type = obj.get('type')
+    if isinstance(type, list):
+        # returns Union class for "type: [integer, number]"
+        return Union(type)
+    else:
+        return mapping.get(type, Object)
+
+
+def get_row_name(name, obj):
+    """Returns the name of the row for the subschema (arrays are named as ``name[]``)."""
+    if get_class_for(obj) is Array:
+        return (name or '') + '[]'
+    else:
+        return name
+
+
+def get_typename_for(obj):
+    """Returns the typename of the subschema without instantiating it."""
+    cls = get_class_for(obj)
+    if isinstance(obj, dict) and isinstance(obj.get('type'), list):
+        return '[%s]' % ', '.join(obj['type'])
+    elif cls is Object and isinstance(obj, dict) and obj.get('title'):
+        return obj['title']
+    else:
+        return cls.type
+
+
+def simplify(obj):
+    if isinstance(obj, dict) and obj.keys() == ['type']:
+        type = obj.get('type')
+        if type is None:
+            return 'null'
+        elif isinstance(type, string_types):
+            return json.dumps(type)
+        else:
+            return str(type)
+    else:
+        return json.dumps(obj)
+
+
+class JSONSchema(object):
+    @classmethod
+    def load(cls, reader):
+        obj = json.load(reader, object_pairs_hook=OrderedDict)
+        return cls.instantiate(None, obj)
+
+    @classmethod
+    def loads(cls, string):
+        obj = json.loads(string, object_pairs_hook=OrderedDict)
+        return cls.instantiate(None, obj)
+
+    @classmethod
+    def loadfromfile(cls, filename):
+        with io.open(filename, 'rt', encoding='utf-8') as reader:
+            return cls.load(reader)
+
+    @classmethod
+    def instantiate(cls, name, obj, required=False):
+        return get_class_for(obj)(name, obj, required)
+
+    @classmethod
+    def diff(cls, old, new):
+        return SchemaDiff(old, new)
+
+
+def get_digest(value, memo):
+    """Returns a digest of JSON value built from the digests of its children."""
+    key = id(value)
+    if key in memo:
+        return memo[key]
+
+    digest = hashlib.sha1()
+    if isinstance(value, dict):
+        digest.update(b'{')
+        for name in sorted(value):
+            digest.update(json.dumps(name).encode('utf-8'))
+            digest.update(get_digest(value[name], memo))
+    elif isinstance(value, list):
+        digest.update(b'[')
+        for item in value:
+            digest.update(get_digest(item, memo))
+    else:
+        digest.update(json.dumps(value).encode('utf-8'))
+
+    if isinstance(value, (dict, list)):
+        memo[key] = digest.digest()
+        return memo[key]
+    else:
+        return digest.digest()
+
+
+class LimitExceeded(Exception):
+    pass
+
+
+class TraversalLimits(object):
+    """Limits for flattening a schema into rows; None means unlimited."""
+    def __init__(self, max_rows=None, max_depth=None, max_nodes=None):
+        self.max_rows = max_rows
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.rows = 0
+        self.nodes = 0
+
+    def count_row(self):
+        if self.max_rows is not None and self.rows >= self.max_rows:
+            raise LimitExceeded('more than %d rows' % self.max_rows)
+        self.rows += 1
+
+    def count_node(self, node):
+        if self.max_depth is not None and node.depth > self.max_depth:
+            raise LimitExceeded('deeper than %d levels' % self.max_depth)
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise LimitExceeded('more than %d nodes' % self.max_nodes)
+        self.nodes += 1
+
+
+def split_name(name):
+    """Splits a row name into segments: ``a.b[].c`` -> ``['a', 'b', '[]', 'c']``"""
+    return re.findall(r'\[[^\]]*\]|[^.\[]+', name)
+
+
+class PatternTrie(object):
+    """Prefix trie of glob patterns for row names.
+
+    Each segment of patterns can contain ``*`` and ``?`` wildcards.
+    """
+    def __init__(self, patterns):
+        self.children = OrderedDict()
+        self.terminal = False
+        for pattern in patterns:
+            self.add(split_name(pattern))
+
+    def add(self, segments):
+        if not segments:
+            self.terminal = True
+            return
+
+        segment = segments[0]
+        if segment not in self.children:
+            regexp = re.escape(segment).replace(r'\*', '.*').replace(r'\?', '.')
+            self.children[segment] = (re.compile(regexp + '$'), PatternTrie([]))
+        self.children[segment][1].add(segments[1:])
+
+    def match(self, name):
+        """Returns ``'match'`` if the name or its ancestor matches to the patterns,
+        ``'prefix'`` if its descendants can match to them, or ``None`` if not.
+        """
+        states = [self]
+        for segment in split_name(name):
+            matched = []
+            for state in states:
+                for regexp, child in state.children.values():
+                    if regexp.match(segment):
+                        if child.terminal:
+                            return 'match'
+                        matched.append(child)
+
+            if not matched:
+                return None
+            states = matched
+
+        return 'prefix'
+
+
+class PropertyFilter(object):
+    def __init__(self, include=None, exclude=None):
+        self.include = PatternTrie(include) if include else None
+        self.exclude = PatternTrie(exclude) if exclude else None
+
+    def accepts(self, name):
+        if self.exclude and self.exclude.match(name) == 'match':
+            return False
+        elif self.include and self.include.match(name) is None:
+            return False
+        else:
+            return True
+
+    def is_uniform(self, name):
+        """Checks all descendants of the name are accepted as well as it."""
+        if self.exclude and self.exclude.match(name) == 'prefix':
+            return False
+        elif self.include and self.include.match(name) == 'prefix':
+            return False
+        else:
+            return True
+
+
+class SharedDefinitions(object):
+    """Registry of the subschemas rendered in a document.
+
+    Subschemas are identified by their digests.  The ones repeated in a schema
+    are rendered once as separated tables, and the ones already rendered in
+    the document are replaced by links to them.
+    """
+    def __init__(self):
+        self.roots = []  # keeps schemas alive while their digests are memoized
+        self.memo = {}
+        self.counts = {}
+        self.refids = {}
+        self.pending = []
+        self.registered = []  # IDs registered by the current directive
+        self.filters = None
+
+    def is_definition(self, obj):
+        return isinstance(obj, dict) and get_class_for(obj) is Object and bool(obj.get('properties'))
+
+    def count(self, schema, filters=None):
+        """Counts the subschemas in the schema which will be rendered."""
+        self.roots.append(schema.attributes)
+        self.counts = {}
+        self.registered = []
+        self.filters = filters
+        self.count_subschemas(schema.attributes, schema.name)
+
+    def count_subschemas(self, obj, name):
+        # follow the traversal of Object.__iter__() and Array.__iter__()
+        children = []
+        cls = get_class_for(obj)
+        if cls is Object and isinstance(obj, dict):
+            prefix = name + '.' if name else ''
+            for key in ('properties', 'patternProperties'):
+                if isinstance(obj.get(key), dict):
+                    children.extend((prefix + prop, value) for prop, value in obj[key].items())
+            if isinstance(obj.get('additionalProperties'), dict):
+                children.append((prefix + '*', obj['additionalProperties']))
+        elif cls is Array:
+            items = obj.get('items')
+            if isinstance(items, dict):
+                children.append((name, items))
+            elif isinstance(items, list):
+                children.extend(('%s[%d]' % (name[:-2], i), item) for i, item in enumerate(items))
+                if isinstance(obj.get('additionalItems'), dict):
+                    children.append(('%s[%d+]' % (name[:-2], len(items)), obj['additionalItems']))
+
+        for child_name, child in children:
+            child_name = get_row_name(child_name, child)
+            if cls is Object and get_class_for(child) is not Object:
+                continue  # Object.__iter__() does not descend into them
+            elif self.filters and not self.filters.accepts(child_name):
+                continue
+
+            if self.is_shareable(child, child_name):
+                digest = get_digest(child, self.memo)
+                self.counts[digest] = self.counts.get(digest, 0) + 1
+                if self.counts[digest] > 1:
+                    continue  # already counted its subschemas
+
+            self.count_subschemas(child, child_name)
+
+    def is_shareable(self, obj, name):
+        if not self.is_definition(obj):
+            return False
+        elif self.filters and not self.filters.is_uniform(name):
+            return False  # the rows of the subschema depend on its name
+        else:
+            return True
+
+    def register(self, node):
+        """Registers the node rendered as a row.
+
+        It sets ``refid`` to the node if it should be rendered as a link to
+        the shared definition, or ``anchor`` if it is rendered there.
+        """
+        if not self.is_shareable(node.attributes, node.name):
+            return
+
+        digest = get_digest(node.attributes, self.memo)
+        if digest in self.refids:
+            node.refid = self.refids[digest]
+            return
+
+        refid = 'jsonschema-%s' % hexlify(digest[:6]).decode('ascii')
+        self.refids[digest] = refid
+        self.registered.append(refid)
+        if self.counts.get(digest, 0) > 1:
+            node.refid = refid
+            self.pending.append(node)
+        else:
+            node.anchor = refid
+
+    def discard(self):
+        """Discards the definitions and anchors registered by the current
+        directive; returns their IDs.
+        """
+        refids = set(self.registered)
+        for digest, refid in list(self.refids.items()):
+            if refid in refids:
+                del self.refids[digest]
+        self.pending = []
+        self.registered = []
+        return refids
+
+
+class SchemaChange(object):
+    def __init__(self, status, name, type, description, validations):
+        self.status = status
+        self.name = name
+        self.type = type
+        self.description = description
+        self.validations = validations
+
+
+class SchemaDiff(object):
+    """Structural diff between two JSON Schemas.
+
+    Subtrees are compared by their digests first; identical subtrees are
+    skipped without traversing them.
+    """
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        # reuse the digests calculated on loading the schemas
+        self.old_memo = old.digests if old.digests is not None else {}
+        self.new_memo = new.digests if new.digests is not None else {}
+
+    def __iter__(self):
+        return self.compare(self.old, self.new)
+
+    def compare(self, old, new):
+        old_digest = get_digest(old.attributes, self.old_memo)
+        new_digest = get_digest(new.attributes, self.new_memo)
+        if old.required == new.required and old_digest == new_digest:
+            return
+
+        found = False
+        change = self.compare_node(old, new)
+        if change is None:
+            # the difference might be in the attributes not rendered to the table
+            names = self.get_changed_attributes(old, new)
+            if names:
+                rules = ['Changed: %s' % ', '.join(sorted(names))]
+                change = SchemaChange('changed', new.name or '(root)', self.get_typename(new), None, rules)
+
+        if change:
+            found = True
+            yield change
+
+        for change in self.compare_children(old, new):
+            found = True
+            yield change
+
+        if not found:
+            rules = ['Changed: its definition']
+            yield SchemaChange('changed', new.name or '(root)', self.get_typename(new), None, rules)
+
+    def compare_children(self, old, new):
+        old_children = OrderedDict((child.name, child) for child in old.get_children())
+        new_children = OrderedDict((child.name, child) for child in new.get_children())
+        for name, child in new_children.items():
+            if name in old_children:
+                for change in self.compare(old_children[name], child):
+                    yield change
+            else:
+                for change in self.flatten('added', child):
+                    yield change
+
+        for name, child in old_children.items():
+            if name not in new_children:
+                for change in self.flatten('removed', child):
+                    yield change
+
+    def get_typename(self, node):
+        if isinstance(node, Array):
+            if isinstance(node.items, dict):
+                item = JSONSchema.instantiate(node.name, node.items)
+                return 'array[%s]' % self.get_typename(item)
+            elif isinstance(node.items, list):
+                items = [JSONSchema.instantiate(node.name, item) for item in node.items]
+                return 'array[%s]' % ','.join(self.get_typename(item) for item in items)
+
+        return node.get_typename()
+
+    def get_changed_attributes(self, old, new):
+        if not isinstance(old.attributes, dict) or not isinstance(new.attributes, dict):
+            return []
+
+        changed = []
+        names = list(new.attributes) + [name for name in old.attributes if name not in new.attributes]
+        for name in names:
+            old_value = old.attributes.get(name)
+            new_value = new.attributes.get(name)
+            if name in ('properties', 'patternProperties', 'items'):
+                continue  # compared as children
+            elif isinstance(old_value, dict) and isinstance(new_value, dict):
+                continue  # subschemas (additionalItems and so on) are compared as children
+            elif name not in old.attributes or name not in new.attributes:
+                changed.append(name)
+            elif get_digest(old_value, self.old_memo) != get_digest(new_value, self.new_memo):
+                changed.append(name)
+
+        return changed
+
+    def compare_node(self, old, new):
+        old_typename = self.get_typename(old)
+        new_typename = self.get_typename(new)
+        if old_typename == new_typename:
+            type = new_typename
+        else:
+            type = '%s -> %s' % (old_typename, new_typename)
+
+        rules = []
+        if old.required and not new.required:
+            rules.append('Removed: It is required')
+        elif not old.required and new.required:
+            rules.append('Added: It is required')
+        old_rules = old.validations
+        new_rules = new.validations
+        rules.extend('Added: %s' % rule for rule in new_rules if rule not in old_rules)
+        rules.extend('Removed: %s' % rule for rule in old_rules if rule not in new_rules)
+
+        if old.description != new.description:
+            description = new.description
+        else:
+            description = None
+
+        if type != new_typename or rules or description is not None:
+            return SchemaChange('changed', new.name or '(root)', type, description, rules)
+        else:
+            return None
+
+    def flatten(self, status, node):
+        if node.required:
+            type = self.get_typename(node) + " (required)"
+        else:
+            type = self.get_typename(node)
+        yield SchemaChange(status, node.name, type, node.description, node.validations)
+
+        for child in node.get_children():
+            for change in self.flatten(status, child):
+                yield change
+
+
+def Union(types):
+    class Union(JSONData):
+        def __init__(self, name, attributes, required=False):
+            super(Union, self).__init__(name, attributes, required)
+            self.elements = []
+            for type in types:
+                elem = get_class_for(type)(name, attributes, required)
+                self.elements.append(elem)
+
+        @property
+        def type(self):
+            return '[%s]' % ', '.join(types)
+
+        @property
+        def validations(self):
+            rules = []
+            for elem in self.elements:
+                rules.extend(elem.validations)
+
+            return rules
+
+    return Union
+
+
+class JSONData(object):
+    depth = 0
+    digests = None  # memo of the digests of subtrees (only for loaded schemas)
+    limits = None
+    filters = None
+    anchor = None  # target ID for the repeated subschema rendered here
+    refid = None  # target ID of the shared definition rendered elsewhere
+
+    def __init__(self, name, attributes, required=False):
+        self.name = name
+        self.attributes = attributes
+        self.required = required
+
+    def __getattr__(self, name):
+        if isinstance(self.attributes, dict):
+            return self.attributes.get(name)
+        else:
+            return None
+
+    def __iter__(self):
+        return iter([])
+
+    def get_children(self):
+        return []
+
+    def instantiate(self, name, obj, required=False, depth=None):
+        """Instantiates a child node which shares the traversal limits and filters."""
+        node = JSONSchema.instantiate(name, obj, required)
+        if depth is None:
+            node.depth = self.depth + 1
+        else:
+            node.depth = depth
+        node.limits = self.limits
+        node.filters = self.filters
+        if self.limits:
+            self.limits.count_node(node)
+        return node
+
+    def copy(self):
+        node = object.__new__(self.__class__)  # shallow copy
+        node.__dict__.update(self.__dict__)
+        return node
+
+    def with_limits(self, limits, filters=None):
+        node = self.copy()
+        node.limits = limits
+        node.filters = filters
+        return node
+
+    def accepts(self, name):
+        return self.filters is None or self.filters.accepts(name)
+
+    def get_typename(self):
+        return self.type
+
+    def stringify(self):
+        return json.dumps(self.attributes)
+
+    @property
+    def validations(self):
+        rules = []
+        if 'enum' in self.attributes:
+            enums = []
+            for enum_type in self.enum:
+                enums.append(simplify(enum_type))
+            rules.append('It must be equal to one of the elements in [%s]' % ', '.join(enums))
+        if 'allOf' in self.attributes:
+            pass
+        if 'anyOf' in self.attributes:
+            pass
+        if 'oneOf' in self.attributes:
+            pass
+        if 'not' in self.attributes:
+            pass
+        if 'definitions' in self.attributes:
+            pass
+        return rules
+
+
+class Null(JSONData):
+    type = "null"
+
+
+class Boolean(JSONData):
+    type = 'boolean'
+
+
+class Integer(JSONData):
+    type = 'integer'
+
+    @property
+    def validations(self):
+        rules = super(Integer, self).validations
+        if 'multipleOf' in self.attributes:
+            rules.append('It must be multiple of %s' % self.multipleOf)
+        if 'maximum' in self.attributes:
+            if self.exclusiveMaximum:
+                rules.append('It must be lower than %s' % self.maximum)
+            else:
+                rules.append('It must be lower than or equal to %s' % self.maximum)
+        if 'minimum' in self.attributes:
+            if self.exclusiveMinimum:
+                rules.append('It must be greater than %s' % self.minimum)
+            else:
+                rules.append('It must be greater than or equal to %s' % self.minimum)
+        return rules
+
+
+class Number(Integer):
+    type = 'number'
+
+
+class String(JSONData):
+    type = "string"
+
+    @property
+    def validations(self):
+        rules = super(String, self).validations
+        if 'maxLength' in self.attributes:
+            rules.append('Its length must be less than or equal to %s' % self.maxLength)
+        if 'minLength' in self.attributes:
+            rules.append('Its length must be greater than or equal to %s' % self.minLength)
+        if 'pattern' in self.attributes:
+            rules.append('It must match to regexp "%s"' % self.pattern)
+        if 'format' in self.attributes:
+            rules.append('It must be formatted as %s' % self.format)
+        return rules
+
+
+class Array(JSONData):
+    type = "array"
+
+    def __init__(self, name, attributes, required=False):
+        if name:
+            name += '[]'
+        else:
+            name = '[]'
+        super(Array, self).__init__(name, attributes, required)
+
+    @property
+    def validations(self):
+        rules = super(Array, self).validations
+        if self.additionalItems is True:
+            rules.append('It allows additional items')
+        if 'maxItems' in self.attributes:
+            rules.append('Its size must be less than or equal to %s' % self.maxItems)
+        if 'minItems' in self.attributes:
+            rules.append('Its size must be greater than or equal to %s' % self.minItems)
+        if 'uniqueItems' in self.attributes:
+            if self.uniqueItems:
+                rules.append('Its elements must be unique')
+        if isinstance(self.items, dict):
+            item = JSONSchema.instantiate(self.name, self.items)
+            if item.type not in ('array', 'object'):
+                rules.extend(item.validations)
+
+        return rules
+
+    def __iter__(self):
+        if isinstance(self.items, dict):
+            item = self.get_item()
+
+            # array object itself
+            array = self.copy()
+            array.type = 'array[%s]' % item.get_typename()
+            yield array
+
+            # properties of items
+            for prop in item:
+                yield prop
+        else:
+            # create items and additionalItems objects
+            items = []
+            types = []
+            for i, item in enumerate(self.items):
+                name = '%s[%d]' % (self.name[:-2], i)
+                types.append(get_typename_for(item))
+                if self.accepts(get_row_name(name, item)):
+                    items.append(self.instantiate(name, item))
+
+            additional = None
+            if isinstance(self.additionalItems, dict):
+                name = '%s[%d+]' % (self.name[:-2], len(self.items))
+                types.append(get_typename_for(self.additionalItems) + '+')
+                if self.accepts(get_row_name(name, self.additionalItems)):
+                    additional = self.instantiate(name, self.additionalItems)
+
+            # array object itself
+            array = self.copy()
+            array.type = 'array[%s]' % ','.join(types)
+            yield array
+
+            # properties of items
+            for item in items:
+                yield item
+                for prop in item:
+                    yield prop
+
+            # additionalItems
+            if additional:
+                yield additional
+
+                for prop in additional:
+                    yield prop
+
+    def get_item(self):
+        """Returns the node for the items; it is not counted as a node as it is
+        rendered in the row of the array itself.
+        """
+        item = JSONSchema.instantiate(self.name, self.items)
+        item.depth = self.depth
+        item.limits = self.limits
+        item.filters = self.filters
+        return item
+
+    def get_children(self):
+        if isinstance(self.items, dict):
+            return self.get_item().get_children()
+        else:
+            children = []
+            for i, item in enumerate(self.items or []):
+                name = '%s[%d]' % (self.name[:-2], i)
+                children.append(self.instantiate(name, item))
+
+            if isinstance(self.additionalItems, dict):
+                name = '%s[%d+]' % (self.name[:-2], len(children))
+                children.append(self.instantiate(name, self.additionalItems))
+
+            return children
+
+
+class Object(JSONData):
+    type = "object"
+
+    def get_typename(self):
+        if self.title:
+            return self.title
+        else:
+            return self.type
+
+    @property
+    def validations(self):
+        rules = super(Object, self).validations
+        if 'maxProperties' in self.attributes:
+            rules.append('Its numbers of properties must be less than or equal to %s' % self.maxProperties)
+        if 'minProperties' in self.attributes:
+            rules.append('Its numbers of properties must be greater than or equal to %s' % self.minProperties)
+        if 'required' in self.attributes:
+            rules.append('Its property set must contains all elements in %s' % self.attributes['required'])
+        if 'dependencies' in self.attributes:
+            for name, attr in self.dependencies.items():
+                if isinstance(attr, dict):
+                    rules.append('The "%s" property must match to %s' % (name, simplify(attr)))
+                else:
+                    attr = (simplify(name) for name in attr)
+                    rules.append('The "%s" property depends on [%s]' % (name, ', '.join(attr)))
+        return rules
+
+    def __iter__(self):
+        for prop in self.get_properties():
+            yield prop
+
+            # refid is set by the consumer if it is rendered as a shared definition
+            if prop.type == "object" and prop.refid is None:
+                for subprop in prop:
+                    yield subprop
+
+    def get_children(self):
+        return self.get_properties()
+
+    def get_properties(self):
+        if self.name:
+            prefix = self.name + '.'
+        else:
+            prefix = ''
+        required = self.attributes.get('required', [])
+
+        for name, attr in self.attributes.get('properties', {}).items():
+            if self.accepts(get_row_name(prefix + name, attr)):
+                yield self.instantiate(prefix + name, attr, name in required)
+
+        for name, attr in self.attributes.get('patternProperties', {}).items():
+            if self.accepts(get_row_name(prefix + name, attr)):
+                yield self.instantiate(prefix + name, attr)
+
+        additional = self.additionalProperties
+        if isinstance(additional, dict) and self.accepts(get_row_name(prefix + '*', additional)):
+            yield self.instantiate(prefix + '*', additional)
+
+
+def on_env_before_read_docs(app, env, docnames):
+    """Load the schemas referred from the documents before reading them.
+
+    The files are read in a thread pool and decoded into the cache in this
+    process.  On parallel builds, the cache is inherited by the forked readers.
+    """
+    workers = get_int_config(app.config, 'jsonschema_prefetch_workers')
+    if not workers:
+        return
+
+    paths = set()
+    for docname in docnames:
+        try:
+            with io.open(env.doc2path(docname), 'rt', encoding=env.config.source_encoding) as reader:
+                source = reader.read()
+        except (IOError, OSError, UnicodeDecodeError):
+            continue
+
+        for arguments in directive_re.findall(source):
+            for filename in arguments.split():
+                relpath, abspath = get_schema_path(env, docname, filename)
+                if not os.access(abspath, os.R_OK):
+                    continue
+
+                cached = schema_cache.get(abspath)
+                if cached is None or cached[0] != os.stat(abspath).st_mtime:
+                    paths.add(abspath)
+
+    if not paths:
+        return
+
+    pool = ThreadPool(min(workers, len(paths)))
+    try:
+        # decode each file while the others are being read
+        for result in pool.imap(read_schema, sorted(paths)):
+            if result:
+                abspath, mtime, data = result
+                try:
+                    cache_schema(abspath, mtime, JSONSchema.loads(data.decode('utf-8')))
+                except ValueError:
+                    pass  # reported by the directive itself
+    finally:
+        pool.close()
+        pool.join()
+
+
+def split_table(table, size):
+    tgroup = table[0]
+    tbody = tgroup[-1]
+    rows = tbody.children[:]
+
+    tables = []
+    for i in range(0, len(rows), size):
+        new_tgroup = tgroup.copy()
+        for child in tgroup[:-1]:  # colspecs and thead
+            new_tgroup += child.deepcopy()
+        new_tgroup += nodes.tbody('', *rows[i:i + size])
+
+        new_table = table.copy()
+        if tables:
+            # labels of the table are kept on the first chunk only
+            new_table['ids'] = []
+            new_table['names'] = []
+        new_table += new_tgroup
+        tables.append(new_table)
+
+    return tables
+
+
+def get_schema_tables(doctree):
+    return [table for table in findall(doctree, nodes.table) if 'jsonschema' in table['classes']]
+
+
+def process_latex_tables(app, doctree):
+    """Marks large schema tables as longtable or splits them."""
+    threshold = get_int_config(app.config, 'jsonschema_latex_longtable_threshold')
+    size = get_int_config(app.config, 'jsonschema_latex_split_rows')
+    for table in get_schema_tables(doctree):
+        tbody = table[0][-1]
+        if size and len(tbody) > size:
+            chunks = split_table(table, size)
+        else:
+            chunks = [table]
+
+        for chunk in chunks:
+            if threshold is not None and len(chunk[0][-1]) > threshold:
+                chunk['classes'].append('longtable')
+
+        if len(chunks) > 1:
+            table.replace_self(chunks)
+
+
+def has_links(node):
+    for subnode in findall(node, nodes.Element):
+        if isinstance(subnode, (nodes.reference, nodes.target)) or (subnode is not node and subnode['ids']):
+            return True
+
+    return False
+
+
+def get_cell_data(app, entry):
+    if has_links(entry):
+        # render cells having links and targets as HTML to keep them
+        container = nodes.container('', *[node.deepcopy() for node in entry.children])
+        html = app.builder.render_partial(container)['fragment']
+        return {'html': html, 'text': entry.astext()}
+
+    bullet_lists = [node for node in entry.children if isinstance(node, nodes.bullet_list)]
+    if bullet_lists:
+        return [item.astext() for bullet_list in bullet_lists for item in bullet_list.children]
+    else:
+        return entry.astext()
+
+
+def process_html_tables(app, doctree, docname):
+    """Replaces large schema tables by virtual scrolling tables.
+
+    The rows are written to a JSON file next to the page and rendered on browser.
+    Their text is kept in the page as hidden text to index it for search.
+    """
+    threshold = get_int_config(app.config, 'jsonschema_html_virtual_threshold')
+    tables = [table for table in get_schema_tables(doctree) if len(table[0][-1]) > threshold]
+    for i, table in enumerate(tables):
+        thead = table[0][-2]
+        tbody = table[0][-1]
+        anchors = {}
+        for index, row in enumerate(tbody):
+            for node in findall(row, nodes.Element):
+                for node_id in node['ids']:
+                    anchors[node_id] = index
+
+        data = {
+            'headers': [entry.astext() for entry in thead[0]],
+            'rows': [[get_cell_data(app, entry) for entry in row] for row in tbody],
+            'anchors': anchors,
+        }
+
+        filename = '%s.jsonschema-%d.json' % (docname, i)
+        path = os.path.join(app.builder.outdir, filename)
+        ensuredir(os.path.dirname(path))
+        with io.open(path, 'wt', encoding='utf-8') as writer:
+            writer.write(text_type(json.dumps(data, separators=(',', ':'), ensure_ascii=False)))
+
+        uri = relative_uri(app.builder.get_target_uri(docname), filename)
+        html = '<div class="jsonschema-virtual" data-src="%s"></div>' % escape(uri, quote=True)
+        search_text = nodes.container('', classes=['jsonschema-search-text'])
+        for row in tbody:
+            search_text += nodes.paragraph(text=' '.join(entry.astext() for entry in row))
+        table.replace_self([nodes.raw('', html, format='html'), search_text])
+
+
+def use_virtual_tables(app):
+    # other HTML builders (epub, htmlhelp and so on) can't load the data files
+    if app.builder.name not in ('html', 'dirhtml', 'singlehtml'):
+        return False
+    else:
+        return get_int_config(app.config, 'jsonschema_html_virtual_threshold') is not None
+
+
+def on_builder_inited(app):
+    if use_virtual_tables(app):
+        static_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+        app.config.html_static_path.append(static_path)
+        if hasattr(app, 'add_js_file'):  # Sphinx 1.8 or above
+            app.add_css_file('jsonschema.css')
+            app.add_js_file('jsonschema.js')
+        else:
+            app.add_stylesheet('jsonschema.css')
+            app.add_javascript('jsonschema.js')
+
+
+def on_doctree_resolved(app, doctree, docname):
+    if app.builder.format == 'latex':
+        process_latex_tables(app, doctree)
+    elif use_virtual_tables(app):
+        process_html_tables(app, doctree, docname)
+
+
+def setup(app):
+    app.add_config_value('jsonschema_prefetch_workers', 0, 'env')
+    app.add_config_value('jsonschema_max_rows', None, 'env')
+    app.add_config_value('jsonschema_cell_cache_size', 1000, '')
+    app.add_config_value('jsonschema_dedupe', False, 'env')
+    app.add_config_value('jsonschema_max_depth', None, 'env')
+    app.add_config_value('jsonschema_max_nodes', None, 'env')
+    app.add_config_value('jsonschema_latex_longtable_threshold', None, '')
+    app.add_config_value('jsonschema_latex_split_rows', None, '')
+    app.add_config_value('jsonschema_html_virtual_threshold', None, '')
+    app.add_directive('jsonschema', JSONSchemaDirective)
+    app.add_directive('jsonschema-diff', JSONSchemaDiffDirective)
+    app.connect('builder-inited', on_builder_inited)
+    app.connect('env-before-read-docs', on_env_before_read_docs)
+    app.connect('doctree-resolved', on_doctree_resolved)
+
+    return {'parallel_read_safe': True}
@@ -0,0 +1,123 @@
+/* virtual scrolling tables of sphinxcontrib-jsonschema */
+(function() {
+  var ROW_HEIGHT = 24;
+  var anchors = {};  // id -> function to scroll to the row having the id
+
+  function text(cell) {
+    if (Array.isArray(cell)) {
+      return cell.join('; ');
+    } else if (cell && cell.html) {
+      return cell.text;
+    } else {
+      return cell;
+    }
+  }
+
+  function build_row(cells, classname) {
+    var row = document.createElement('div');
+    row.className = classname;
+    cells.forEach(function(cell) {
+      var div = document.createElement('div');
+      if (cell && cell.html) {
+        div.innerHTML = cell.html;
+      } else {
+        div.textContent = text(cell);
+      }
+      div.title = text(cell);
+      row.appendChild(div);
+    });
+    return row;
+  }
+
+  function setup(container, data) {
+    var filter = document.createElement('input');
+    var viewport = document.createElement('div');
+    var spacer = document.createElement('div');
+    var body = document.createElement('div');
+    var rows = data.rows;
+
+    filter.type = 'search';
+    filter.placeholder = 'Filter';
+    viewport.className = 'jsonschema-viewport';
+    body.className = 'jsonschema-body';
+    viewport.appendChild(spacer);
+    viewport.appendChild(body);
+    container.appendChild(filter);
+    container.appendChild(build_row(data.headers, 'jsonschema-row jsonschema-header'));
+    container.appendChild(viewport);
+
+    function draw() {
+      var first = Math.floor(viewport.scrollTop / ROW_HEIGHT);
+      var count = Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 1;
+      spacer.style.height = rows.length * ROW_HEIGHT + 'px';
+      body.style.top = first * ROW_HEIGHT + 'px';
+      body.innerHTML = '';
+      rows.slice(first, first + count).forEach(function(row) {
+        body.appendChild(build_row(row, 'jsonschema-row'));
+      });
+    }
+
+    filter.addEventListener('input', function() {
+      var keyword = filter.value.toLowerCase();
+      rows = data.rows.filter(function(row) {
+        return row.some(function(cell) {
+          return text(cell).toLowerCase().indexOf(keyword) >= 0;
+        });
+      });
+      viewport.scrollTop = 0;
+      draw();
+    });
+    viewport.addEventListener('scroll', draw);
+    draw();
+
+    Object.keys(data.anchors).forEach(function(id) {
+      anchors[id] = function() {
+        filter.value = '';
+        rows = data.rows;
+        container.scrollIntoView();
+        viewport.scrollTop = data.anchors[id] * ROW_HEIGHT;
+        draw();
+      };
+    });
+    reveal(window.location.hash.slice(1));
+  }
+
+  function reveal(id) {
+    if (id && !document.getElementById(id) && anchors[id]) {
+      anchors[id]();
+      return true;
+    }
+    return false;
+  }
+
+  function fail(container) {
+    container.textContent = 'Failed to load the table from ' + container.getAttribute('data-src');
+  }
+
+  document.addEventListener('click', function(event) {
+    var link = event.target.closest && event.target.closest('a[href^="#"]');
+    if (link && reveal(link.getAttribute('href').slice(1))) {
+      event.preventDefault();
+    }
+  });
+
+  document.addEventListener('DOMContentLoaded', function() {
+    var containers = document.querySelectorAll('div.jsonschema-virtual');
+    Array.prototype.forEach.call(containers, function(container) {
+      var request = new XMLHttpRequest();
+      request.open('GET', container.getAttribute('data-src'));
+      request.onload = function() {
+        // status is 0 for file:// URLs on some browsers
+        if ((request.status === 200 || request.status === 0) && request.responseText) {
+          setup(container, JSON.parse(request.responseText));
+        } else {
+          fail(container);
+        }
+      };
+      request.onerror = function() {
+        fail(container);
+      };
+      request.send();
+    });
+  });
+})();
@@ -0,0 +1,3 @@
+master_doc = 'index'
+extensions = ['sphinxcontrib.jsonschema']
+jsonschema_dedupe = True
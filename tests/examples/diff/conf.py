@@ -0,0 +1,2 @@
+master_doc = 'index'
+extensions = ['sphinxcontrib.jsonschema']
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import json
+import os
+import re
 import sys
 from sphinx_testing import with_app
+from sphinxcontrib.jsonschema import schema_cache, on_env_before_read_docs
 
 if sys.version_info < (2, 7):
     import unittest2 as unittest
@@ -13,3 +17,184 @@ class TestJsonSchema(unittest.TestCase):
     @with_app(srcdir='tests/examples/basic')
     def test_basic(self, app, status, warning):
         app.build()  # succeeded!
+
+    @with_app(srcdir='tests/examples/basic', confoverrides={'jsonschema_prefetch_workers': 2})
+    def test_prefetch(self, app, status, warning):
+        schema_cache.clear()
+        on_env_before_read_docs(app, app.env, ['index'])
+
+        abspath = os.path.join(app.srcdir, 'subdir', 'test.json')
+        self.assertIn(abspath, schema_cache)
+
+    @with_app(srcdir='tests/examples/basic')
+    def test_prefetch_is_disabled_by_default(self, app, status, warning):
+        schema_cache.clear()
+        on_env_before_read_docs(app, app.env, ['index'])
+
+        self.assertEqual(schema_cache, {})
+
+    @with_app(srcdir='tests/examples/diff', copy_srcdir_to_tmpdir=True)
+    def test_diff(self, app, status, warning):
+        app.build()
+
+        html = (app.outdir / 'index.html').read_text()
+        self.assertIn('<p>email</p>', html)
+        self.assertIn('<p>added</p>', html)
+        self.assertIn('<p>fax</p>', html)
+        self.assertIn('<p>removed</p>', html)
+
+    @with_app(srcdir='tests/examples/basic', confoverrides={'jsonschema_max_rows': 2})
+    def test_max_rows(self, app, status, warning):
+        app.build()
+
+        html = (app.outdir / 'index.html').read_text()
+        self.assertIn('<p>name</p>', html)
+        self.assertIn('<p>age</p>', html)
+        self.assertNotIn('<p>mailAddress</p>', html)
+        self.assertIn('Truncated: the schema has more than 2 rows', html)
+        self.assertIn('JSON Schema subdir/test.json is truncated', warning.getvalue())
+
+    @with_app(srcdir='tests/examples/basic', buildername='latex',
+              confoverrides={'project': 'basic',
+                             'jsonschema_latex_split_rows': 3,
+                             'jsonschema_latex_longtable_threshold': 2})
+    def test_latex_split_rows(self, app, status, warning):
+        app.build()
+
+        latex = (app.outdir / 'basic.tex').read_text()
+        self.assertEqual(latex.count(r'\begin{longtable}'), 1)  # 3 rows
+        self.assertEqual(latex.count(r'\begin{tabulary}'), 1)  # 1 row
+        self.assertIn('Validations', latex[latex.index(r'\begin{tabulary}'):])  # header is repeated
+        self.assertLess(latex.index('mailAddress'), latex.index(r'\end{longtable}'))
+        self.assertGreater(latex.index('otherContacts'), latex.index(r'\begin{tabulary}'))
+        self.assertEqual(latex.count(r'\label{\detokenize{index:person}}'), 1)
+
+    @with_app(srcdir='tests/examples/basic', confoverrides={'jsonschema_html_virtual_threshold': 2})
+    def test_html_virtual_table(self, app, status, warning):
+        app.build()
+
+        html = (app.outdir / 'index.html').read_text()
+        self.assertIn('<div class="jsonschema-virtual" data-src="index.jsonschema-0.json"></div>', html)
+        self.assertNotIn('<p>mailAddress</p>', html)
+        self.assertIn('id="person"', html)  # label of the table
+
+        # assets are shipped as static files
+        self.assertIn('_static/jsonschema.js', html)
+        self.assertIn('_static/jsonschema.css', html)
+        self.assertTrue((app.outdir / '_static' / 'jsonschema.js').exists())
+
+        # the rows are indexed for search
+        self.assertIn('mailaddress', (app.outdir / 'searchindex.js').read_text())
+
+        data = json.loads((app.outdir / 'index.jsonschema-0.json').read_text())
+        self.assertEqual(data['headers'], ['Name', 'Type', 'Description', 'Validations'])
+        self.assertEqual(len(data['rows']), 4)
+        self.assertEqual(data['rows'][1], ['age', 'integer', '',
+                                           ['It must be lower than or equal to 80',
+                                            'It must be greater than or equal to 20']])
+
+    @with_app(srcdir='tests/examples/basic')
+    def test_html_without_virtual_table(self, app, status, warning):
+        app.build()
+
+        html = (app.outdir / 'index.html').read_text()
+        self.assertNotIn('jsonschema.js', html)
+
+    @with_app(srcdir='tests/examples/basic')
+    def test_cell_cache(self, app, status, warning):
+        caches = {}
+
+        def on_doctree_read(app, doctree):
+            # the cache is kept per document in temp_data
+            caches[app.env.docname] = app.env.temp_data.get('jsonschema_cell_cache')
+
+        app.connect('doctree-read', on_doctree_read)
+        app.build()
+
+        self.assertIn('string', caches['index'])
+        self.assertEqual(caches['index']['string'][0].astext(), 'string')
+
+        html = (app.outdir / 'index.html').read_text()
+        self.assertEqual(html.count('<p>string</p>'), 2)  # name and mailAddress
+
+    @with_app(srcdir='tests/examples/dedupe')
+    def test_dedupe(self, app, status, warning):
+        app.build()
+
+        html = (app.outdir / 'index.html').read_text()
+        self.assertEqual(html.count('Definition: address'), 1)
+        self.assertEqual(html.count('<p>postal_code</p>'), 1)
+        self.assertNotIn('<p>billing.postal_code</p>', html)
+        self.assertEqual(html.count('<p>contact.email</p>'), 1)  # linked from user.json
+
+        refids = re.findall('<a class="reference internal" href="#(jsonschema-[0-9a-f]+)">object</a>', html)
+        self.assertEqual(len(refids), 3)  # billing, shipping and contact in user.json
+        for refid in refids:
+            self.assertIn('id="%s"' % refid, html)
+
+    @with_app(srcdir='tests/examples/basic', confoverrides={'jsonschema_max_rows': '2'})
+    def test_max_rows_from_command_line(self, app, status, warning):
+        app.build()  # -D option gives the value as a string
+
+        html = (app.outdir / 'index.html').read_text()
+        self.assertIn('Truncated: the schema has more than 2 rows', html)
+
+    @with_app(srcdir='tests/examples/dedupe', confoverrides={'jsonschema_html_virtual_threshold': 1})
+    def test_html_virtual_table_with_links(self, app, status, warning):
+        app.build()
+
+        data = json.loads((app.outdir / 'index.jsonschema-0.json').read_text())
+        self.assertEqual(data['rows'][0][0], 'billing')
+        self.assertIn('<a class="reference internal" href="#jsonschema-', data['rows'][0][1]['html'])
+        self.assertEqual(data['rows'][0][1]['text'], 'object')
+        self.assertEqual(list(data['anchors'].values()), [2])  # contact
+
+    @with_app(srcdir='tests/examples/basic', buildername='epub',
+              confoverrides={'jsonschema_html_virtual_threshold': 1})
+    def test_epub_does_not_virtualize_tables(self, app, status, warning):
+        app.build()
+
+        html = (app.outdir / 'index.xhtml').read_text()
+        self.assertNotIn('jsonschema-virtual', html)
+        self.assertIn('<p>mailAddress</p>', html)
+
+    @with_app(srcdir='tests/examples/dedupe')
+    def test_dedupe_with_filters(self, app, status, warning):
+        app.build()
+
+        # subschemas filtered partially are not shared
+        html = (app.outdir / 'exclude.html').read_text()
+        self.assertNotIn('Definition: address', html)
+        self.assertIn('<p>billing.postal_code</p>', html)
+        self.assertIn('<p>shipping.postal_code</p>', html)
+        self.assertNotIn('prefecture', html)
+
+        html = (app.outdir / 'include.html').read_text()
+        self.assertIn('Definition: address', html)
+        self.assertIn('<p>postal_code</p>', html)
+        self.assertIn('<p>prefecture</p>', html)
+        self.assertNotIn('<p>contact</p>', html)
+
+    @with_app(srcdir='tests/examples/dedupe')
+    def test_empty_filter(self, app, status, warning):
+        app.build()  # not aborted
+
+        self.assertIn('argument required but none supplied', warning.getvalue())
+
+    @with_app(srcdir='tests/examples/dedupe')
+    def test_dedupe_with_limits(self, app, status, warning):
+        app.build()
+
+        html = (app.outdir / 'limits.html').read_text()
+        self.assertIn('Truncated: the schema has more than 2 rows', html)
+        for refid in re.findall('href="#(jsonschema-[0-9a-f]+)"', html):
+            self.assertIn('id="%s"' % refid, html)
+
+        # the second directive renders the definition by itself
+        self.assertIn('Definition: address', html)
+
+        # the anchors in truncated tables are not linked
+        html = (app.outdir / 'user_limits.html').read_text()
+        self.assertIn('<p>contact.email</p>', html)
+        for refid in re.findall('id="(jsonschema-[0-9a-f]+)"', html):
+            self.assertEqual(html.count('id="%s"' % refid), 1)
@@ -4,7 +4,9 @@ import sys
 import json
 from shutil import rmtree
 from tempfile import mkdtemp, NamedTemporaryFile
-from sphinxcontrib.jsonschema import JSONSchema
+from sphinxcontrib.jsonschema import (
+    JSONSchema, LimitExceeded, PropertyFilter, TraversalLimits, cache_schema, is_cacheable
+)
 
 if sys.version_info < (2, 7):
     import unittest2 as unittest
@@ -384,3 +386,268 @@ class TestJsonSchema(unittest.TestCase):
                           'It must be greater than or equal to 0',
                           'Its length must be less than or equal to 100',
                           'Its length must be greater than or equal to 0'])
+
+    def test_diff(self):
+        old = JSONSchema.loads("""{
+            "type": "object",
+            "properties": {
+                "name": "string",
+                "age": {"type": "integer", "minimum": 0},
+                "address" : {
+                    "type": "object",
+                    "properties": {
+                        "prefecture": "string",
+                        "postal_code": "string"
+                    }
+                },
+                "fax": "string"
+            }
+        }""")
+        new = JSONSchema.loads("""{
+            "type": "object",
+            "properties": {
+                "name": "string",
+                "age": {"type": "integer", "minimum": 18},
+                "address" : {
+                    "type": "object",
+                    "properties": {
+                        "prefecture": "string",
+                        "postal_code": "string"
+                    }
+                },
+                "email": {"type": "string", "format": "email"}
+            },
+            "required": ["name"]
+        }""")
+        changes = list(JSONSchema.diff(old, new))
+        self.assertEqual(len(changes), 5)
+
+        self.assertEqual(changes[0].status, 'changed')
+        self.assertEqual(changes[0].name, '(root)')
+        self.assertEqual(changes[0].validations,
+                         ["Added: Its property set must contains all elements in ['name']"])
+
+        self.assertEqual(changes[1].status, 'changed')
+        self.assertEqual(changes[1].name, 'name')
+        self.assertEqual(changes[1].validations, ['Added: It is required'])
+
+        self.assertEqual(changes[2].status, 'changed')
+        self.assertEqual(changes[2].name, 'age')
+        self.assertEqual(changes[2].type, 'integer')
+        self.assertEqual(changes[2].validations,
+                         ['Added: It must be greater than or equal to 18',
+                          'Removed: It must be greater than or equal to 0'])
+
+        self.assertEqual(changes[3].status, 'added')
+        self.assertEqual(changes[3].name, 'email')
+        self.assertEqual(changes[3].validations, ['It must be formatted as email'])
+
+        self.assertEqual(changes[4].status, 'removed')
+        self.assertEqual(changes[4].name, 'fax')
+
+    def test_diff_identical(self):
+        data = """{
+            "type": "object",
+            "properties": {
+                "items": {"type": "array", "items": {"type": "string"}}
+            }
+        }"""
+        changes = list(JSONSchema.diff(JSONSchema.loads(data), JSONSchema.loads(data)))
+        self.assertEqual(changes, [])
+
+    def test_limits(self):
+        data = """{
+            "type": "object",
+            "properties": {
+                "name": "string",
+                "address" : {
+                    "type": "object",
+                    "properties": {
+                        "prefecture": "string",
+                        "postal_code": "string"
+                    }
+                }
+            }
+        }"""
+        schema = JSONSchema.loads(data)
+        props = list(schema.with_limits(TraversalLimits(max_depth=2)))
+        self.assertEqual(len(props), 4)
+
+        with self.assertRaises(LimitExceeded):
+            list(schema.with_limits(TraversalLimits(max_depth=1)))
+
+        with self.assertRaises(LimitExceeded):
+            list(schema.with_limits(TraversalLimits(max_nodes=3)))
+
+        data = """{
+            "type": "array",
+            "items": {"type": "object", "properties": {"id": "string"}}
+        }"""
+        schema = JSONSchema.loads(data)
+        props = list(schema.with_limits(TraversalLimits()))
+        self.assertEqual([prop.name for prop in props], ['[]', '[].id'])
+
+    def test_limits_for_array_property(self):
+        data = """{
+            "type": "object",
+            "properties": {
+                "name": "string",
+                "tags": {"type": "array", "items": {"type": "string", "maxLength": 8}},
+                "age": "integer"
+            }
+        }"""
+        schema = JSONSchema.loads(data)
+        limits = TraversalLimits(max_depth=1)
+        props = list(schema.with_limits(limits))
+        self.assertEqual([prop.name for prop in props], ['name', 'tags[]', 'age'])
+        self.assertEqual(limits.nodes, 3)
+
+        # reading validations does not count the items as nodes
+        props[1].validations
+        props[1].validations
+        self.assertEqual(limits.nodes, 3)
+
+        # the properties of items are one level deeper than the array
+        data = """{
+            "type": "array",
+            "items": {"type": "object", "properties": {"id": "string"}}
+        }"""
+        schema = JSONSchema.loads(data)
+        props = list(schema.with_limits(TraversalLimits(max_depth=1)))
+        self.assertEqual([prop.name for prop in props], ['[]', '[].id'])
+
+        with self.assertRaises(LimitExceeded):
+            list(schema.with_limits(TraversalLimits(max_depth=0)))
+
+    def test_row_limits(self):
+        limits = TraversalLimits(max_rows=2)
+        limits.count_row()
+        limits.count_row()
+        with self.assertRaises(LimitExceeded):
+            limits.count_row()
+
+    def test_is_cacheable(self):
+        from docutils.core import publish_doctree
+
+        self.assertTrue(is_cacheable(publish_doctree('It must be **unique**')))
+        self.assertFalse(is_cacheable(publish_doctree('See `JSON Schema`_')))
+        self.assertFalse(is_cacheable(publish_doctree('.. _target:\n\nparagraph')))
+
+    def test_property_filter(self):
+        data = """{
+            "type": "object",
+            "properties": {
+                "name": "string",
+                "internal": {
+                    "type": "object",
+                    "properties": {
+                        "id": "string"
+                    }
+                },
+                "address" : {
+                    "type": "object",
+                    "properties": {
+                        "prefecture": "string",
+                        "postal_code": "string"
+                    }
+                }
+            }
+        }"""
+        schema = JSONSchema.loads(data)
+        filters = PropertyFilter(exclude=['internal'])
+        props = list(schema.with_limits(TraversalLimits(), filters))
+        self.assertEqual([prop.name for prop in props],
+                         ['name', 'address', 'address.prefecture', 'address.postal_code'])
+
+        filters = PropertyFilter(include=['name', 'address.post*'])
+        props = list(schema.with_limits(TraversalLimits(), filters))
+        self.assertEqual([prop.name for prop in props],
+                         ['name', 'address', 'address.postal_code'])
+
+        # excluded subtrees are not instantiated
+        limits = TraversalLimits()
+        list(schema.with_limits(limits, PropertyFilter(exclude=['internal', 'address'])))
+        self.assertEqual(limits.nodes, 1)
+
+    def test_property_filter_for_array(self):
+        data = """{
+            "type": "array",
+            "items": [
+                {"type": "number"},
+                {"type": "object", "properties": {"id": "string", "secret": "string"}}
+            ]
+        }"""
+        schema = JSONSchema.loads(data)
+        filters = PropertyFilter(exclude=['[0]', '[*].secret'])
+        props = list(schema.with_limits(TraversalLimits(), filters))
+        self.assertEqual([prop.name for prop in props], ['[]', '[1]', '[1].id'])
+        self.assertEqual(props[0].type, 'array[number,object]')
+
+        # excluded items are not instantiated
+        limits = TraversalLimits()
+        list(schema.with_limits(limits, PropertyFilter(exclude=['[*]'])))
+        self.assertEqual(limits.nodes, 0)  # only the root array is rendered
+
+    def test_diff_unrendered_changes(self):
+        old = JSONSchema.loads("""{
+            "type": "object",
+            "properties": {
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "name": {"type": "string", "title": "name", "default": "foo"}
+            }
+        }""")
+        new = JSONSchema.loads("""{
+            "type": "object",
+            "properties": {
+                "tags": {"type": "array", "items": {"type": "integer"}},
+                "name": {"type": "string", "title": "user name", "default": "bar"}
+            },
+            "additionalProperties": false
+        }""")
+        changes = list(JSONSchema.diff(old, new))
+        self.assertEqual([(change.name, change.type, change.validations) for change in changes],
+                         [('(root)', 'object', ['Changed: additionalProperties']),
+                          ('tags[]', 'array[string] -> array[integer]', []),
+                          ('name', 'string', ['Changed: default, title'])])
+
+    def test_diff_reuses_digests(self):
+        schema = JSONSchema.loads('{"type": "object", "properties": {"name": {"type": "string"}}}')
+        cache_schema('/path/to/schema.json', 0, schema)
+        self.assertIn(id(schema.attributes), schema.digests)
+
+        diff = JSONSchema.diff(schema, schema)
+        self.assertIs(diff.old_memo, schema.digests)
+        self.assertEqual(list(diff), [])
+
+    def test_diff_limits(self):
+        old = JSONSchema.loads('{"type": "object", "properties": {}}')
+        new = JSONSchema.loads("""{
+            "type": "object",
+            "properties": {
+                "address" : {
+                    "type": "object",
+                    "properties": {
+                        "prefecture": "string",
+                        "postal_code": "string"
+                    }
+                }
+            }
+        }""")
+        limits = TraversalLimits(max_nodes=2)
+        with self.assertRaises(LimitExceeded):
+            list(JSONSchema.diff(old.with_limits(limits), new.with_limits(limits)))
+
+    def test_property_filter_for_array_property(self):
+        data = """{
+            "type": "object",
+            "properties": {
+                "name": "string",
+                "tags": {"type": "array", "items": {"type": "string"}}
+            }
+        }"""
+        schema = JSONSchema.loads(data)
+        props = list(schema.with_limits(TraversalLimits(), PropertyFilter(exclude=['tags[]'])))
+        self.assertEqual([prop.name for prop in props], ['name'])
+
+        props = list(schema.with_limits(TraversalLimits(), PropertyFilter(include=['tags[]'])))
+        self.assertEqual([prop.name for prop in props], ['tags[]'])